@@ -0,0 +1,126 @@
+# change_batcher.py
+
+import threading
+import time
+
+UPSERT = 'upsert'
+DELETE = 'delete'
+
+# --- Configuration ---
+# First retry delay for a failed change; doubles on every further failure
+RETRY_BASE_SECONDS = 5.0
+# Upper bound on the retry delay
+RETRY_MAX_SECONDS = 300.0
+# ---------------------
+
+
+class ChangeBatcher:
+    """Debounces file events and coalesces them into one pending change per path.
+
+    Watcher threads call record(); the sync thread takes all ready changes
+    at once, so new events keep landing in a fresh dict while a batch is
+    being applied. Failed changes are requeued with exponential backoff
+    and are held back until their retry time, even past max_delay.
+    """
+
+    def __init__(self, debounce: float, max_delay: float, retry_base: float = RETRY_BASE_SECONDS,
+                 retry_max: float = RETRY_MAX_SECONDS, clock=time.monotonic):
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+        self._clock = clock
+        # path -> {'operation', 'first_seen', 'attempts', 'not_before'}
+        self._pending = {}
+        self._last_event = 0.0
+        self._condition = threading.Condition()
+
+    def record(self, path: str, operation: str):
+        """Records a change; a later event for the same path replaces the earlier one."""
+
+        now = self._clock()
+        with self._condition:
+            first_seen = self._pending[path]['first_seen'] if path in self._pending else now
+            # A fresh edit supersedes any pending retry, so its backoff is reset
+            self._pending[path] = {'operation': operation, 'first_seen': first_seen, 'attempts': 0, 'not_before': 0.0}
+            self._last_event = now
+            self._condition.notify()
+
+    def requeue(self, changes: dict):
+        """Puts failed changes back with backoff unless a newer event already superseded them."""
+
+        now = self._clock()
+        with self._condition:
+            for path, change in changes.items():
+                if path in self._pending:
+                    continue
+                attempts = change['attempts'] + 1
+                delay = min(self.retry_base * 2 ** (attempts - 1), self.retry_max)
+                self._pending[path] = dict(change, attempts=attempts, not_before=now + delay)
+            self._condition.notify()
+
+    def wake(self):
+        """Wakes a sync thread blocked in take_batch (used on shutdown)."""
+
+        with self._condition:
+            self._condition.notify_all()
+
+    def depth(self) -> int:
+        with self._condition:
+            return len(self._pending)
+
+    def retrying(self) -> int:
+        """Number of pending changes that are waiting out a retry backoff."""
+
+        with self._condition:
+            return sum(1 for change in self._pending.values() if change['attempts'])
+
+    def oldest_age(self) -> float:
+        """Seconds since the oldest unsynced change was first seen (0 if none)."""
+
+        with self._condition:
+            if not self._pending:
+                return 0.0
+            oldest = min(change['first_seen'] for change in self._pending.values())
+        return self._clock() - oldest
+
+    def _next_batch(self):
+        """Returns (batch, seconds to wait before checking again); caller holds the lock."""
+
+        if not self._pending:
+            return {}, None
+
+        now = self._clock()
+        ready = {path: change for path, change in self._pending.items() if change['not_before'] <= now}
+        backoff_wait = min((change['not_before'] - now for change in self._pending.values()
+                            if change['not_before'] > now), default=None)
+
+        if not ready:
+            return {}, backoff_wait
+
+        quiet_for = now - self._last_event
+        oldest_age = now - min(change['first_seen'] for change in ready.values())
+        if quiet_for >= self.debounce or oldest_age >= self.max_delay:
+            for path in ready:
+                del self._pending[path]
+            return ready, None
+
+        wait = min(self.debounce - quiet_for, self.max_delay - oldest_age)
+        return {}, wait if backoff_wait is None else min(wait, backoff_wait)
+
+    def poll(self) -> dict:
+        """Returns the ready batch without blocking ({} if nothing is ready yet)."""
+
+        with self._condition:
+            return self._next_batch()[0]
+
+    def take_batch(self, stop_event: threading.Event) -> dict:
+        """Blocks until a batch is ready (or stop is set) and returns it."""
+
+        with self._condition:
+            while not stop_event.is_set():
+                batch, wait = self._next_batch()
+                if batch:
+                    return batch
+                self._condition.wait(timeout=None if wait is None else max(wait, 0.05))
+            return {}
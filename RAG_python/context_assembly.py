@@ -0,0 +1,309 @@
+# context_assembly.py
+
+import argparse
+import hashlib
+import json
+import math
+import os
+import re
+from collections import Counter, OrderedDict
+
+# --- Configuration ---
+# Directory used by the CLI demo (same as ingest_data.py)
+DATA_DIRECTORY = 'data'
+# Max tokens of retrieved content passed to the model
+TOKEN_BUDGET = 800
+# MMR trade-off: 1.0 = pure relevance, 0.0 = pure diversity
+MMR_LAMBDA = 0.7
+# Sentences at least this similar to an already selected one are dropped
+DUPLICATE_THRESHOLD = 0.8
+# Sentences scoring below this fraction of the best relevance are never added
+# (sentences sharing no content word with the query are never added either)
+RELEVANCE_FLOOR = 0.1
+# Number of assembled contexts kept for repeated queries
+CACHE_SIZE = 256
+# Chunking used by the CLI demo (mirrors the store's white space chunking)
+CHUNK_TOKENS = 200
+CHUNK_OVERLAP_TOKENS = 50
+# ---------------------
+
+WORD_PATTERN = re.compile(r"\w+", re.UNICODE)
+TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]", re.UNICODE)
+URL_PATTERN = re.compile(r"https?://\S+")
+# Split after . ! ? only when followed by whitespace and a capital letter or
+# quote, so "Rp. 5.000", "1.2" and URLs stay in one sentence; lines always split
+SENTENCE_BOUNDARY = re.compile(r"(?:(?<=[.!?])|(?<=[.!?][\"'”’)]))\s+(?=[A-Z\"'“‘(\[])|\s*\n\s*", re.UNICODE)
+# Common Indonesian/English function words, ignored when comparing sentences
+STOPWORDS = frozenset("""
+    ada adalah agar akan aku antara atau bagi bahwa banyak beberapa begitu belum berbagai bisa dalam dan dari
+    dengan di dia ia ini itu jika juga kami kamu karena ke kepada ketika lagi lalu maka masih mereka nya oleh
+    pada para pun saat sangat saja sebagai sedang sehingga sejak semua sendiri seperti serta setelah sudah
+    tentang telah tetapi untuk yang
+    a an and are as at be by for from has in is it of on or that the this to was were with
+""".split())
+
+
+def estimate_tokens(text: str) -> int:
+    """Fast local token estimate: one token per ~4 characters of each word, one per symbol."""
+
+    return sum(math.ceil(len(piece) / 4) for piece in TOKEN_PATTERN.findall(text))
+
+
+def split_sentences(text: str) -> list:
+    """Splits a passage into sentences (or lines, for JSON/list-like content)."""
+
+    return [s.strip() for s in SENTENCE_BOUNDARY.split(text) if WORD_PATTERN.search(s)]
+
+
+def term_vector(text: str) -> Counter:
+    """Bag of lowercase content words (stopwords and URLs removed)."""
+
+    words = (w.lower() for w in WORD_PATTERN.findall(URL_PATTERN.sub(' ', text)))
+    return Counter(word for word in words if word not in STOPWORDS)
+
+
+def idf_weighted(vectors: list) -> list:
+    """Reweights term vectors by inverse document frequency across the given sentences."""
+
+    document_frequency = Counter(word for vector in vectors for word in vector)
+    total = len(vectors)
+    idf = {word: math.log((total + 1) / (count + 1)) + 1 for word, count in document_frequency.items()}
+    return [Counter({word: count * idf[word] for word, count in vector.items()}) for vector in vectors]
+
+
+def cosine_similarity(a: Counter, b: Counter) -> float:
+    if not a or not b:
+        return 0.0
+    if len(a) > len(b):
+        a, b = b, a
+    dot = sum(count * b.get(word, 0) for word, count in a.items())
+    if not dot:
+        return 0.0
+    norm_a = math.sqrt(sum(count * count for count in a.values()))
+    norm_b = math.sqrt(sum(count * count for count in b.values()))
+    return dot / (norm_a * norm_b)
+
+
+def scored_passages(passages: list) -> list:
+    """Returns (text, score) pairs with scores mapped to 0..1, best passage first.
+
+    Retriever scores come on arbitrary scales and signs, so they are
+    normalised by their range. Plain strings, or scores that are all equal,
+    fall back to 1 / (rank + 1).
+    """
+
+    if passages and all(isinstance(passage, (list, tuple)) for passage in passages):
+        low = min(score for _, score in passages)
+        high = max(score for _, score in passages)
+        if high > low:
+            return [(text, (score - low) / (high - low)) for text, score in passages]
+
+    return [(passage[0] if isinstance(passage, (list, tuple)) else passage, 1.0 / (rank + 1))
+            for rank, passage in enumerate(passages)]
+
+
+class ContextAssembler:
+    """Packs ranked passages into a token budget, dropping redundant sentences (MMR).
+
+    Passages are given best first, either as strings or as (text, score)
+    pairs. Only sentences sharing a content word with the query are
+    eligible; their relevance mixes the passage score with similarity to
+    the query. Selection then greedily maximises
+    lambda * relevance - (1 - lambda) * similarity to what is already kept.
+    """
+
+    def __init__(self, token_budget: int = TOKEN_BUDGET, mmr_lambda: float = MMR_LAMBDA,
+                 duplicate_threshold: float = DUPLICATE_THRESHOLD, relevance_floor: float = RELEVANCE_FLOOR,
+                 cache_size: int = CACHE_SIZE):
+        self.token_budget = token_budget
+        self.mmr_lambda = mmr_lambda
+        self.duplicate_threshold = duplicate_threshold
+        self.relevance_floor = relevance_floor
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self.total_requests = 0
+        self.total_tokens_saved = 0
+        self.cache_hits = 0
+
+    def _cache_key(self, query: str, passages: list) -> str:
+        payload = json.dumps([query, passages, self.token_budget, self.mmr_lambda, self.duplicate_threshold,
+                              self.relevance_floor], ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _candidates(self, query: str, passages: list) -> list:
+        """Returns one candidate per unique sentence with its relevance score."""
+
+        query_vector = term_vector(query)
+        candidates = {}
+
+        for rank, (text, score) in enumerate(scored_passages(passages)):
+            for position, sentence in enumerate(split_sentences(text)):
+                key = ' '.join(WORD_PATTERN.findall(sentence.lower()))
+                if key in candidates:
+                    # Exact repeat from an overlapping chunk: keep the best-ranked copy
+                    continue
+                vector = term_vector(sentence)
+                similarity = cosine_similarity(query_vector, vector)
+                candidates[key] = {
+                    'text': sentence,
+                    'order': (rank, position),
+                    'vector': vector,
+                    'tokens': estimate_tokens(sentence),
+                    # A query of only stopwords leaves the passage score to decide
+                    'eligible': similarity > 0 or not query_vector,
+                    'relevance': 0.5 * score + 0.5 * similarity,
+                }
+
+        # Drop chunk-boundary fragments whose words all appear in a longer sentence
+        keys = sorted(candidates, key=len, reverse=True)
+        for index, key in enumerate(keys):
+            if any(f' {key} ' in f' {longer} ' for longer in keys[:index] if longer in candidates):
+                del candidates[key]
+
+        candidates = list(candidates.values())
+        # Redundancy uses IDF weights so words shared by most sentences count for little
+        for candidate, weighted in zip(candidates, idf_weighted([c['vector'] for c in candidates])):
+            candidate['weighted'] = weighted
+        return candidates
+
+    def _select(self, candidates: list) -> list:
+        selected = []
+        used_tokens = 0
+        eligible = [c for c in candidates if c['eligible']]
+        if not eligible:
+            return selected
+
+        min_relevance = self.relevance_floor * max(c['relevance'] for c in eligible)
+        remaining = sorted((c for c in eligible if c['relevance'] > 0 and c['relevance'] >= min_relevance),
+                           key=lambda c: c['relevance'], reverse=True)
+
+        while remaining:
+            best, best_score, best_index = None, None, None
+            for index, candidate in enumerate(remaining):
+                if used_tokens + candidate['tokens'] > self.token_budget:
+                    continue
+                redundancy = max((cosine_similarity(candidate['weighted'], s['weighted']) for s in selected),
+                                 default=0.0)
+                if redundancy >= self.duplicate_threshold:
+                    continue
+                score = self.mmr_lambda * candidate['relevance'] - (1 - self.mmr_lambda) * redundancy
+                if best_score is None or score > best_score:
+                    best, best_score, best_index = candidate, score, index
+            # Nothing left that adds more relevance than it repeats
+            if best is None or best_score <= 0:
+                break
+            selected.append(best)
+            used_tokens += best['tokens']
+            del remaining[best_index]
+
+        return selected
+
+    def assemble(self, query: str, passages: list) -> dict:
+        """Builds the context for a query from ranked passages and reports tokens saved."""
+
+        self.total_requests += 1
+        key = self._cache_key(query, passages)
+
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            self.cache_hits += 1
+            result = dict(self._cache[key], cache_hit=True)
+            self.total_tokens_saved += result['tokens_saved']
+            return result
+
+        candidates = self._candidates(query, passages)
+        selected = self._select(candidates)
+
+        # Keep the original passage order so the context still reads naturally
+        selected.sort(key=lambda c: c['order'])
+        context = '\n'.join(candidate['text'] for candidate in selected)
+
+        input_tokens = sum(estimate_tokens(p[0] if isinstance(p, (list, tuple)) else p) for p in passages)
+        context_tokens = estimate_tokens(context)
+        result = {
+            'context': context,
+            'input_tokens': input_tokens,
+            'context_tokens': context_tokens,
+            'tokens_saved': max(input_tokens - context_tokens, 0),
+            'sentences_kept': len(selected),
+            'sentences_dropped': len(candidates) - len(selected),
+            'cache_hit': False,
+        }
+
+        self._cache[key] = result
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+        self.total_tokens_saved += result['tokens_saved']
+        return dict(result)
+
+    def stats(self) -> dict:
+        return {
+            'requests': self.total_requests,
+            'cache_hits': self.cache_hits,
+            'total_tokens_saved': self.total_tokens_saved,
+        }
+
+
+def chunk_text(text: str, chunk_tokens: int = CHUNK_TOKENS, overlap_tokens: int = CHUNK_OVERLAP_TOKENS) -> list:
+    """Splits text into overlapping whitespace chunks, similar to the store's chunking."""
+
+    # Keep each word's trailing whitespace so line breaks survive chunking
+    words = re.findall(r"\S+\s*", text)
+    step = max(chunk_tokens - overlap_tokens, 1)
+    return [''.join(words[start:start + chunk_tokens]).strip() for start in range(0, max(len(words), 1), step)
+            if words[start:start + chunk_tokens]]
+
+
+def load_local_passages(query: str, directory: str = DATA_DIRECTORY, top_k: int = 8) -> list:
+    """Ranks overlapping chunks of the local data files against the query (stand-in for File Search)."""
+
+    query_vector = term_vector(query)
+    chunks = []
+    for filename in sorted(os.listdir(directory)):
+        if not filename.endswith(('.json', '.txt')):
+            continue
+        with open(os.path.join(directory, filename), 'r', encoding='utf-8') as f:
+            for chunk in chunk_text(f.read()):
+                chunks.append((chunk, cosine_similarity(query_vector, term_vector(chunk))))
+
+    chunks.sort(key=lambda c: c[1], reverse=True)
+    return chunks[:top_k]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Assemble a token-budgeted context from retrieved passages.")
+    parser.add_argument('query', help="user question")
+    parser.add_argument('--budget', type=int, default=TOKEN_BUDGET, help="token budget for the context")
+    parser.add_argument('--lambda', dest='mmr_lambda', type=float, default=MMR_LAMBDA)
+    parser.add_argument('--duplicate-threshold', type=float, default=DUPLICATE_THRESHOLD)
+    parser.add_argument('--relevance-floor', type=float, default=RELEVANCE_FLOOR)
+    parser.add_argument('--top-k', type=int, default=8, help="number of passages to retrieve")
+    parser.add_argument('--passages', help="JSON file with ranked passages (strings or [text, score])")
+    parser.add_argument('--show-context', action='store_true')
+    args = parser.parse_args()
+
+    if args.passages:
+        with open(args.passages, 'r', encoding='utf-8') as f:
+            passages = json.load(f)
+    else:
+        if not os.path.exists(DATA_DIRECTORY):
+            print(f"❌ Error: Directory '{DATA_DIRECTORY}' not found.")
+            return
+        passages = load_local_passages(args.query, top_k=args.top_k)
+
+    assembler = ContextAssembler(args.budget, args.mmr_lambda, args.duplicate_threshold, args.relevance_floor)
+    result = assembler.assemble(args.query, passages)
+
+    if args.show_context:
+        print(result['context'])
+        print()
+
+    print(f"📦 Passages: {len(passages)}")
+    print(f"🔢 Tokens: {result['input_tokens']} -> {result['context_tokens']} "
+          f"(saved {result['tokens_saved']}, budget {args.budget})")
+    print(f"✂️ Sentences kept: {result['sentences_kept']}, dropped: {result['sentences_dropped']}")
+
+
+if __name__ == "__main__":
+    main()
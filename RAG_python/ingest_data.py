@@ -18,6 +18,8 @@ FILE_STORE_DISPLAY_NAME = 'Flutter Chatbot Knowledge Base'
 DATA_DIRECTORY = 'data'
 # ⚠️ 3. Specify the mime type for your files (important for processing)
 MIME_TYPE = 'application/json'
+# ⚠️ 4. Seconds before a REST call to the API is given up
+REQUEST_TIMEOUT = 30
 # ---------------------
 
 
@@ -31,7 +33,7 @@ def delete_store(store_name: str, api_key: str) -> bool:
 
     try:
         print(f"🗑️ Deleting existing store: {store_name}")
-        response = requests.delete(url, headers=headers)
+        response = requests.delete(url, headers=headers, timeout=REQUEST_TIMEOUT)
 
         if response.status_code == 200:
             print(f"✅ Successfully deleted store: {store_name}")
@@ -45,6 +47,57 @@ def delete_store(store_name: str, api_key: str) -> bool:
         return False
 
 
+def list_documents(store_name: str, api_key: str) -> list:
+    """Lists all documents in a file search store using the REST API endpoint."""
+
+    url = f"https://generativelanguage.googleapis.com/v1beta/{store_name}/documents"
+    documents = []
+    page_token = None
+
+    while True:
+        params = {'key': api_key, 'pageSize': 20}
+        if page_token:
+            params['pageToken'] = page_token
+
+        response = requests.get(url, params=params, timeout=REQUEST_TIMEOUT)
+        response.raise_for_status()
+        data = response.json()
+
+        documents.extend(data.get('documents', []))
+        page_token = data.get('nextPageToken')
+        if not page_token:
+            return documents
+
+
+def delete_document(document_name: str, api_key: str) -> bool:
+    """Deletes a single document (and its chunks) from a file search store."""
+
+    url = f"https://generativelanguage.googleapis.com/v1beta/{document_name}?key={api_key}&force=true"
+
+    try:
+        response = requests.delete(url, timeout=REQUEST_TIMEOUT)
+
+        if response.status_code == 200:
+            print(f"🗑️ Deleted document: {document_name}")
+            return True
+        else:
+            print(f"❌ Failed to delete document. Status: {response.status_code}")
+            print(f"Response: {response.text}")
+            return False
+    except Exception as e:
+        print(f"❌ Error deleting document: {e}")
+        return False
+
+
+def find_store(client: genai.Client):
+    """Returns the existing store with FILE_STORE_DISPLAY_NAME, or None."""
+
+    for store in client.file_search_stores.list():
+        if store.display_name == FILE_STORE_DISPLAY_NAME:
+            return store
+    return None
+
+
 def create_or_get_store(client: genai.Client, api_key: str) -> types.FileSearchStore:
     """Finds an existing store by display name, deletes it, and creates a new one."""
 
@@ -73,6 +126,48 @@ def create_or_get_store(client: genai.Client, api_key: str) -> types.FileSearchS
     return new_store
 
 
+def upload_file(client: genai.Client, store_name: str, file_path: str, display_name: str) -> bool:
+    """Uploads a single file to the store and waits for indexing to finish."""
+
+    try:
+        # Upload the file and initiate the indexing process
+        operation = client.file_search_stores.upload_to_file_search_store(
+            file=file_path,
+            file_search_store_name=store_name,
+            config={
+                'display_name': display_name,
+                # 'mime_type': MIME_TYPE,
+                # Optional: Custom chunking config for complex JSON data
+                # 'chunking_config': {
+                #     'white_space_config': {
+                #         'max_tokens_per_chunk': 512,
+                #         'max_overlap_tokens': 50
+                #     }
+                # }
+            }
+        )
+
+        print("🚀 Upload initiated. Waiting for indexing to complete...")
+
+        # Polling the long-running operation status
+        while not operation.done:
+            time.sleep(5)
+            operation = client.operations.get(operation)
+            print(".", end="", flush=True)
+
+        if operation.error:
+            print(
+                f"\n❌ Indexing failed for {display_name}: {operation.error.message}")
+            return False
+
+        print(f"\n✅ Indexing complete for {display_name}.")
+        return True
+
+    except Exception as e:
+        print(f"\n❌ An error occurred while processing {display_name}: {e}")
+        return False
+
+
 def upload_and_process_files(client: genai.Client, store_name: str):
     """Uploads all files from the data directory to the specified store."""
 
@@ -94,41 +189,7 @@ def upload_and_process_files(client: genai.Client, store_name: str):
         file_path = os.path.join(DATA_DIRECTORY, filename)
 
         print(f"\n--- Processing {filename} ---")
-
-        try:
-            # Upload the file and initiate the indexing process
-            operation = client.file_search_stores.upload_to_file_search_store(
-                file=file_path,
-                file_search_store_name=store_name,
-                config={
-                    'display_name': filename,
-                    # 'mime_type': MIME_TYPE,
-                    # Optional: Custom chunking config for complex JSON data
-                    # 'chunking_config': {
-                    #     'white_space_config': {
-                    #         'max_tokens_per_chunk': 512,
-                    #         'max_overlap_tokens': 50
-                    #     }
-                    # }
-                }
-            )
-
-            print("🚀 Upload initiated. Waiting for indexing to complete...")
-
-            # Polling the long-running operation status
-            while not operation.done:
-                time.sleep(5)
-                operation = client.operations.get(operation)
-                print(".", end="", flush=True)
-
-            if operation.error:
-                print(
-                    f"\n❌ Indexing failed for {filename}: {operation.error.message}")
-            else:
-                print(f"\n✅ Indexing complete for {filename}.")
-
-        except Exception as e:
-            print(f"\n❌ An error occurred while processing {filename}: {e}")
+        upload_file(client, store_name, file_path, filename)
 
 
 def get_api_key():
@@ -0,0 +1,148 @@
+import threading
+
+from change_batcher import DELETE, UPSERT, ChangeBatcher
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+def make_batcher(debounce=5.0, max_delay=60.0, retry_base=10.0, retry_max=40.0):
+    clock = FakeClock()
+    batcher = ChangeBatcher(debounce, max_delay, retry_base=retry_base, retry_max=retry_max, clock=clock)
+    return batcher, clock
+
+
+def test_debounce_waits_for_quiet_period():
+    batcher, clock = make_batcher()
+    batcher.record('a.txt', UPSERT)
+    clock.advance(3)
+    batcher.record('b.txt', UPSERT)
+    clock.advance(4)
+
+    assert batcher.poll() == {}
+
+    clock.advance(1)
+    assert set(batcher.poll()) == {'a.txt', 'b.txt'}
+    assert batcher.depth() == 0
+
+
+def test_burst_on_same_path_is_coalesced():
+    batcher, clock = make_batcher()
+    for _ in range(5):
+        batcher.record('a.txt', UPSERT)
+        clock.advance(1)
+    batcher.record('a.txt', DELETE)
+    clock.advance(5)
+
+    batch = batcher.poll()
+    assert list(batch) == ['a.txt']
+    assert batch['a.txt']['operation'] == DELETE
+    assert batch['a.txt']['first_seen'] == 100.0
+
+
+def test_max_delay_releases_batch_during_continuous_edits():
+    batcher, clock = make_batcher(debounce=5.0, max_delay=20.0)
+    for _ in range(5):
+        batcher.record('a.txt', UPSERT)
+        clock.advance(4)
+
+    assert set(batcher.poll()) == {'a.txt'}
+
+
+def test_requeue_backs_off_exponentially():
+    batcher, clock = make_batcher(debounce=5.0, max_delay=20.0, retry_base=10.0, retry_max=40.0)
+    batcher.record('a.txt', UPSERT)
+    clock.advance(30)
+    batch = batcher.poll()
+
+    expected_delays = [10.0, 20.0, 40.0, 40.0]
+    for delay in expected_delays:
+        batcher.requeue(batch)
+        # Past max_delay already, but still held back by the backoff
+        clock.advance(delay - 0.5)
+        assert batcher.poll() == {}
+        assert batcher.depth() == 1
+        clock.advance(0.5)
+        batch = batcher.poll()
+        assert set(batch) == {'a.txt'}
+
+    assert batch['a.txt']['attempts'] == len(expected_delays)
+    assert batch['a.txt']['first_seen'] == 100.0
+
+
+def test_backoff_does_not_hold_back_other_changes():
+    batcher, clock = make_batcher()
+    batcher.record('a.txt', UPSERT)
+    clock.advance(5)
+    batcher.requeue(batcher.poll())
+    batcher.record('b.txt', UPSERT)
+    clock.advance(5)
+
+    assert set(batcher.poll()) == {'b.txt'}
+    assert batcher.retrying() == 1
+
+
+def test_requeue_is_superseded_by_newer_event():
+    batcher, clock = make_batcher()
+    batcher.record('a.txt', UPSERT)
+    clock.advance(5)
+    batch = batcher.poll()
+
+    # The file was deleted while the failed upsert was in flight
+    batcher.record('a.txt', DELETE)
+    batcher.requeue(batch)
+    clock.advance(5)
+
+    batch = batcher.poll()
+    assert batch['a.txt']['operation'] == DELETE
+    assert batch['a.txt']['attempts'] == 0
+
+
+def test_new_event_resets_backoff():
+    batcher, clock = make_batcher()
+    batcher.record('a.txt', UPSERT)
+    clock.advance(5)
+    batcher.requeue(batcher.poll())
+    batcher.record('a.txt', UPSERT)
+    clock.advance(5)
+
+    batch = batcher.poll()
+    assert batch['a.txt']['attempts'] == 0
+    assert batcher.retrying() == 0
+
+
+def test_oldest_age_reports_freshness_lag():
+    batcher, clock = make_batcher()
+    assert batcher.oldest_age() == 0.0
+    batcher.record('a.txt', UPSERT)
+    clock.advance(3)
+    batcher.record('b.txt', UPSERT)
+    clock.advance(2)
+
+    assert batcher.oldest_age() == 5.0
+
+
+def test_take_batch_blocks_until_debounced_and_stops_on_event():
+    batcher = ChangeBatcher(debounce=0.05, max_delay=1.0)
+    stop_event = threading.Event()
+    batcher.record('a.txt', UPSERT)
+
+    assert set(batcher.take_batch(stop_event)) == {'a.txt'}
+
+    result = {}
+    thread = threading.Thread(target=lambda: result.update(batch=batcher.take_batch(stop_event)))
+    thread.start()
+    stop_event.set()
+    batcher.wake()
+    thread.join(timeout=2)
+
+    assert not thread.is_alive()
+    assert result['batch'] == {}
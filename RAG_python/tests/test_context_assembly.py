@@ -0,0 +1,81 @@
+from context_assembly import ContextAssembler, estimate_tokens, load_local_passages, scored_passages, split_sentences
+
+
+def test_split_keeps_numbers_abbreviations_and_urls_intact():
+    assert split_sentences("Harga tiket Rp. 5.000 per orang. Versi 1.2 dirilis.") == [
+        'Harga tiket Rp. 5.000 per orang.',
+        'Versi 1.2 dirilis.',
+    ]
+    assert split_sentences("Sumber: https://www.detik.com/jateng. Selesai") == [
+        'Sumber: https://www.detik.com/jateng.',
+        'Selesai',
+    ]
+
+
+def test_split_on_quotes_and_lines():
+    assert split_sentences('Dia berkata. "Tunggu!" Lalu pergi\n"features": [') == [
+        'Dia berkata.',
+        '"Tunggu!"',
+        'Lalu pergi',
+        '"features": [',
+    ]
+
+
+def test_overlapping_passages_are_deduplicated():
+    passages = [
+        "Raksasa itu memberikan biji mentimun kepada Mbok Randa. Mbok Randa menanamnya.",
+        "memberikan biji mentimun kepada Mbok Randa. Mbok Randa menanamnya. Mentimun itu tumbuh besar.",
+    ]
+    result = ContextAssembler(token_budget=200).assemble("biji mentimun Mbok Randa", passages)
+
+    assert result['context'].count('biji mentimun') == 1
+    assert 'Mentimun itu tumbuh besar.' in result['context']
+
+
+def test_context_stays_within_budget():
+    query = "bagaimana Timun Mas lolos dari raksasa"
+    result = ContextAssembler(token_budget=120).assemble(query, load_local_passages(query, directory='data'))
+
+    assert 0 < estimate_tokens(result['context']) <= 120
+    assert result['tokens_saved'] == result['input_tokens'] - result['context_tokens']
+
+
+def test_irrelevant_sentences_are_not_used_as_filler():
+    query = "apa saja fitur aplikasi budaya Sembara"
+    result = ContextAssembler(token_budget=200).assemble(query, load_local_passages(query, directory='data'))
+
+    assert 'QR Code Scanning' in result['context']
+    assert 'Galeri multimedia' in result['context']
+    assert 'Enam tahun sudah berlalu.' not in result['context']
+    assert 'detik.' not in result['context']
+
+
+def test_sentences_without_query_words_are_not_kept():
+    query = "siapa yang memberi biji mentimun kepada Mbok Randa"
+    result = ContextAssembler(token_budget=300).assemble(query, load_local_passages(query, directory='data'))
+
+    assert 'Raksasa itu memberikan biji mentimun kepada Mbok Randa.' in result['context']
+    for sentence in ('Enam tahun sudah berlalu.', 'Dia pun memutar otak.', 'Bayi itu tumbuh menjadi anak yang cantik.'):
+        assert sentence not in result['context']
+
+
+def test_negative_and_equal_scores_keep_rank_order():
+    passages = [["Timun Mas lari ke hutan.", -2.0], ["Timun Mas menabur garam.", -5.0]]
+    assert [score for _, score in scored_passages(passages)] == [1.0, 0.0]
+
+    tied = [["Timun Mas lari ke hutan.", 0.0], ["Timun Mas menabur garam.", 0.0]]
+    assert [score for _, score in scored_passages(tied)] == [1.0, 0.5]
+
+    result = ContextAssembler(token_budget=100).assemble("Timun Mas", passages)
+    assert result['sentences_kept'] == 2
+
+
+def test_repeated_query_hits_cache():
+    assembler = ContextAssembler(token_budget=100)
+    first = assembler.assemble("Timun Mas", ["Timun Mas lari. Raksasa mengejar."])
+    second = assembler.assemble("Timun Mas", ["Timun Mas lari. Raksasa mengejar."])
+
+    assert not first['cache_hit']
+    assert second['cache_hit']
+    assert second['context'] == first['context']
+    assert assembler.stats()['cache_hits'] == 1
@@ -0,0 +1,367 @@
+# watch_data.py
+
+import argparse
+import json
+import os
+import re
+import sys
+import threading
+import time
+from datetime import datetime
+from google import genai
+
+from change_batcher import DELETE, UPSERT, ChangeBatcher
+from ingest_data import (
+    DATA_DIRECTORY,
+    delete_document,
+    find_store,
+    get_api_key,
+    list_documents,
+    upload_file,
+)
+
+# --- Configuration ---
+# Seconds of quiet after the last edit before a batch is synced
+DEBOUNCE_SECONDS = 5.0
+# Upper bound on how long an edit may wait while edits keep arriving
+MAX_DELAY_SECONDS = 60.0
+# Scan interval for the polling fallback
+POLL_INTERVAL_SECONDS = 2.0
+# How often queue depth / freshness lag is reported
+STATUS_INTERVAL_SECONDS = 30.0
+STATUS_FILE = 'watch_status.json'
+WATCHED_EXTENSIONS = ('.json', '.txt')
+# ---------------------
+
+
+def is_watched_file(path: str) -> bool:
+    """Returns True for data files that belong in the store (skips editor temp files)."""
+
+    name = os.path.basename(path)
+    if name.startswith('.') or name.endswith('~'):
+        return False
+    return name.endswith(WATCHED_EXTENSIONS)
+
+
+def scan_directories(directories: list) -> dict:
+    """Returns {path: (mtime, size)} for every watched file in the directories."""
+
+    snapshot = {}
+    for directory in directories:
+        if not os.path.isdir(directory):
+            continue
+        for filename in os.listdir(directory):
+            path = os.path.join(directory, filename)
+            if not is_watched_file(path) or not os.path.isfile(path):
+                continue
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+    return snapshot
+
+
+class StoreSyncer:
+    """Applies coalesced batches of upserts and deletes to an existing store."""
+
+    def __init__(self, client: genai.Client, store_name: str, api_key: str, batcher: ChangeBatcher, root: str):
+        self.client = client
+        self.store_name = store_name
+        self.api_key = api_key
+        self.batcher = batcher
+        # Display names are paths relative to root, so equal filenames in
+        # different watched directories map to different documents
+        self.root = root
+        self.in_flight = 0
+        self.last_sync_at = None
+        self.last_attempt_at = None
+        self.last_batch = None
+        self.failures = 0
+        self._lock = threading.Lock()
+
+    def display_name(self, path: str) -> str:
+        return os.path.relpath(path, self.root).replace(os.sep, '/')
+
+    def path_for(self, display_name: str) -> str:
+        return os.path.join(self.root, *display_name.split('/'))
+
+    def documents_by_display_name(self) -> dict:
+        """Returns {display_name: [document, ...]} for every named document in the store."""
+
+        documents = {}
+        for document in list_documents(self.store_name, self.api_key):
+            display_name = document.get('displayName')
+            if not display_name:
+                # Not uploaded by us (or by ingest_data.py); leave it alone
+                continue
+            documents.setdefault(display_name, []).append(document)
+        return documents
+
+    def apply_batch(self, batch: dict):
+        """Uploads changed files and removes documents for deleted files."""
+
+        with self._lock:
+            self.in_flight = len(batch)
+
+        started = time.monotonic()
+        failed = {}
+        upserts = deletes = 0
+
+        try:
+            documents = self.documents_by_display_name()
+        except Exception as e:
+            print(f"❌ Could not list store documents, retrying batch later: {e}")
+            documents = None
+            failed = dict(batch)
+
+        if documents is not None:
+            for path, change in sorted(batch.items()):
+                display_name = self.display_name(path)
+                applied = True
+
+                if change['operation'] == UPSERT and os.path.isfile(path):
+                    print(f"\n--- Upserting {display_name} ---")
+                    # Upload first so the content never disappears from the store
+                    applied = upload_file(self.client, self.store_name, path, display_name)
+                else:
+                    print(f"\n--- Deleting {display_name} ---")
+
+                if applied:
+                    for document in documents.get(display_name, []):
+                        if not delete_document(document['name'], self.api_key):
+                            applied = False
+
+                if not applied:
+                    failed[path] = change
+                elif change['operation'] == UPSERT and os.path.isfile(path):
+                    upserts += 1
+                else:
+                    deletes += 1
+
+        if failed:
+            self.batcher.requeue(failed)
+
+        with self._lock:
+            self.in_flight = 0
+            self.failures += len(failed)
+            self.last_attempt_at = time.time()
+            # Only count as a sync when something reached the store, so an
+            # outage shows up as growing seconds_since_last_sync
+            if upserts or deletes:
+                self.last_sync_at = self.last_attempt_at
+            self.last_batch = {
+                'size': len(batch),
+                'upserts': upserts,
+                'deletes': deletes,
+                'failed': len(failed),
+                'duration_seconds': round(time.monotonic() - started, 2),
+            }
+
+        print(f"\n🔄 Synced batch of {len(batch)} change(s): "
+              f"{upserts} upserted, {deletes} deleted, {len(failed)} failed")
+
+    def status(self) -> dict:
+        with self._lock:
+            now = time.time()
+            since_sync = None if self.last_sync_at is None else round(now - self.last_sync_at, 1)
+            since_attempt = None if self.last_attempt_at is None else round(now - self.last_attempt_at, 1)
+            return {
+                'queue_depth': self.batcher.depth(),
+                'retrying': self.batcher.retrying(),
+                'in_flight': self.in_flight,
+                'oldest_pending_seconds': round(self.batcher.oldest_age(), 1),
+                'seconds_since_last_sync': since_sync,
+                'seconds_since_last_attempt': since_attempt,
+                'last_batch': self.last_batch,
+                'total_failures': self.failures,
+            }
+
+    def run(self, stop_event: threading.Event):
+        while not stop_event.is_set():
+            batch = self.batcher.take_batch(stop_event)
+            if batch:
+                self.apply_batch(batch)
+
+
+def parse_timestamp(value: str):
+    """Parses an RFC 3339 timestamp from the API into epoch seconds (None if missing/invalid)."""
+
+    if not value:
+        return None
+    # The API may return nanoseconds; datetime only handles microseconds
+    match = re.match(r"^(\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2})(?:\.(\d+))?(Z|[+-]\d{2}:\d{2})$", value)
+    if not match:
+        return None
+    base, fraction, zone = match.groups()
+    fraction = (fraction or '0')[:6].ljust(6, '0')
+    zone = '+00:00' if zone == 'Z' else zone
+    return datetime.fromisoformat(f"{base}.{fraction}{zone}").timestamp()
+
+
+def reconcile(syncer: StoreSyncer, directories: list, full_resync: bool):
+    """Queues changes so the store matches the files currently on disk."""
+
+    snapshot = scan_directories(directories)
+    on_disk = {syncer.display_name(path): path for path in snapshot}
+    in_store = syncer.documents_by_display_name()
+
+    for display_name, path in on_disk.items():
+        if full_resync or display_name not in in_store:
+            syncer.batcher.record(path, UPSERT)
+            continue
+
+        # Upsert files edited while the watcher was not running
+        uploaded_at = [parse_timestamp(d.get('updateTime') or d.get('createTime')) for d in in_store[display_name]]
+        modified_at = snapshot[path][0] / 1e9
+        if None in uploaded_at or modified_at > max(uploaded_at):
+            syncer.batcher.record(path, UPSERT)
+
+    for display_name in in_store:
+        if display_name not in on_disk:
+            syncer.batcher.record(syncer.path_for(display_name), DELETE)
+
+
+def start_inotify_watcher(directories: list, batcher: ChangeBatcher):
+    """Starts a watchdog observer (inotify on Linux). Raises if unavailable."""
+
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+
+    class Handler(FileSystemEventHandler):
+        def on_created(self, event):
+            if not event.is_directory and is_watched_file(event.src_path):
+                batcher.record(event.src_path, UPSERT)
+
+        on_modified = on_created
+
+        def on_deleted(self, event):
+            if not event.is_directory and is_watched_file(event.src_path):
+                batcher.record(event.src_path, DELETE)
+
+        def on_moved(self, event):
+            if event.is_directory:
+                return
+            if is_watched_file(event.src_path):
+                batcher.record(event.src_path, DELETE)
+            if is_watched_file(event.dest_path):
+                batcher.record(event.dest_path, UPSERT)
+
+    observer = Observer()
+    handler = Handler()
+    for directory in directories:
+        observer.schedule(handler, directory, recursive=False)
+    observer.daemon = True
+    observer.start()
+    return observer
+
+
+def run_polling_watcher(directories: list, batcher: ChangeBatcher, interval: float, stop_event: threading.Event):
+    """Fallback watcher that diffs directory snapshots every `interval` seconds."""
+
+    previous = scan_directories(directories)
+    while not stop_event.wait(interval):
+        current = scan_directories(directories)
+        for path, signature in current.items():
+            if previous.get(path) != signature:
+                batcher.record(path, UPSERT)
+        for path in previous.keys() - current.keys():
+            batcher.record(path, DELETE)
+        previous = current
+
+
+def report_status(syncer: StoreSyncer, interval: float, stop_event: threading.Event):
+    """Prints and writes queue depth / freshness lag every `interval` seconds."""
+
+    while not stop_event.wait(interval):
+        status = syncer.status()
+        with open(STATUS_FILE, 'w', encoding='utf-8') as f:
+            json.dump(status, f, indent=2)
+        print(f"\n📊 queue={status['queue_depth']} retrying={status['retrying']} in_flight={status['in_flight']} "
+              f"oldest_pending={status['oldest_pending_seconds']}s "
+              f"since_last_sync={status['seconds_since_last_sync']}s")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Watch data directories and sync changes to the File Search Store.")
+    parser.add_argument('directories', nargs='*', default=[DATA_DIRECTORY],
+                        help=f"directories to watch (default: {DATA_DIRECTORY})")
+    parser.add_argument('--debounce', type=float, default=DEBOUNCE_SECONDS)
+    parser.add_argument('--max-delay', type=float, default=MAX_DELAY_SECONDS)
+    parser.add_argument('--poll-interval', type=float, default=POLL_INTERVAL_SECONDS)
+    parser.add_argument('--status-interval', type=float, default=STATUS_INTERVAL_SECONDS)
+    parser.add_argument('--polling', action='store_true', help="force the polling watcher instead of inotify")
+    parser.add_argument('--full-resync', action='store_true',
+                        help="re-upload every file on startup instead of only missing or changed ones")
+    parser.add_argument('--no-initial-sync', action='store_true', help="skip reconciling the store on startup")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    for directory in args.directories:
+        if not os.path.isdir(directory):
+            print(f"❌ Error: Directory '{directory}' not found.")
+            sys.exit(1)
+
+    # Absolute paths keep watcher events and reconcile keyed the same way
+    args.directories = [os.path.abspath(directory) for directory in args.directories]
+    root = os.path.commonpath(args.directories)
+
+    api_key = get_api_key()
+    client = genai.Client(api_key=api_key)
+
+    store = find_store(client)
+    if store is None:
+        print("❌ No existing store found. Run `python ingest_data.py` once first.")
+        sys.exit(1)
+    print(f"✅ Using store: {store.name}")
+
+    stop_event = threading.Event()
+    batcher = ChangeBatcher(args.debounce, args.max_delay)
+    syncer = StoreSyncer(client, store.name, api_key, batcher, root)
+
+    if not args.no_initial_sync:
+        print("Reconciling store with files on disk...")
+        reconcile(syncer, args.directories, args.full_resync)
+
+    observer = None
+    if not args.polling:
+        try:
+            observer = start_inotify_watcher(args.directories, batcher)
+            print(f"👀 Watching {', '.join(args.directories)} (inotify)")
+        except (ImportError, OSError) as e:
+            print(f"⚠️ inotify watcher unavailable ({e}), falling back to polling")
+
+    threads = [
+        threading.Thread(target=syncer.run, args=(stop_event,), daemon=True),
+        threading.Thread(target=report_status, args=(syncer, args.status_interval, stop_event), daemon=True),
+    ]
+    if observer is None:
+        threads.append(threading.Thread(
+            target=run_polling_watcher,
+            args=(args.directories, batcher, args.poll_interval, stop_event),
+            daemon=True,
+        ))
+        print(f"👀 Watching {', '.join(args.directories)} (polling every {args.poll_interval}s)")
+
+    for thread in threads:
+        thread.start()
+
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        print("\n🛑 Stopping watcher...")
+    finally:
+        stop_event.set()
+        if observer is not None:
+            observer.stop()
+            observer.join()
+        batcher.wake()
+        threads[0].join()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,491 @@
+"""
+Benchmark Personality Test
+Mengukur performa scoring, perhitungan persentase, penentuan archetype,
+dan pencocokan top-k (euclidean) pada populasi hasil tes sintetis
+"""
+
+import argparse
+import contextlib
+import cProfile
+import heapq
+import io
+import json
+import os
+import platform
+import pstats
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Dict, List
+
+from euclidean import calculate_euclidean_distance
+from personality_quiz import PersonalityQuiz
+
+DEFAULT_SCALES = [1_000, 100_000, 10_000_000]
+DEFAULT_QUESTIONS = "questions5.json"
+STAGES = ["scoring", "percentages", "archetype", "matching"]
+BATCH_SIZE = 10_000
+DEFAULT_REPEATS = 5
+# Tahap dengan median di bawah batas ini terlalu berisik untuk dibandingkan
+MIN_COMPARE_SECONDS = 0.05
+# Field yang harus sama agar dua hasil benchmark boleh dibandingkan
+COMPARABLE_FIELDS = {
+    "config": ["questions", "question_count", "batch_size", "top_k"],
+    "environment": ["implementation", "python"]
+}
+
+
+def load_quiz(json_file: str) -> PersonalityQuiz:
+    """
+    Buat PersonalityQuiz tanpa mencetak log pemuatan soal
+
+    Args:
+        json_file: Path ke file pertanyaan
+
+    Returns:
+        PersonalityQuiz: Objek kuis dengan max_scores terisi
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        return PersonalityQuiz(json_file, "benchmark")
+
+
+def build_weight_table(quiz: PersonalityQuiz) -> List[List[Dict[str, int]]]:
+    """
+    Susun weights setiap opsi per pertanyaan, urut berdasarkan kunci opsi
+
+    Args:
+        quiz: Objek kuis
+
+    Returns:
+        list: weights_table[nomor_soal][indeks_opsi] = weights
+    """
+    table = []
+    for question in quiz.questions:
+        options = question['options']
+        table.append([options[key].get('weights', {}) for key in sorted(options.keys())])
+    return table
+
+
+def generate_answer_sheets(rng: random.Random, weight_table: List[List[Dict[str, int]]], count: int):
+    """
+    Buat lembar jawaban sintetis (list weights yang dipilih per soal)
+
+    Args:
+        rng: Random generator dengan seed tetap
+        weight_table: Hasil build_weight_table
+        count: Jumlah lembar jawaban
+
+    Returns:
+        list: List lembar jawaban
+    """
+    return [[rng.choice(options) for options in weight_table] for _ in range(count)]
+
+
+def score_sheets(quiz: PersonalityQuiz, sheets) -> List[Dict[str, int]]:
+    """Hitung skor mentah setiap lembar jawaban lewat PersonalityQuiz.add_scores"""
+    results = []
+    dimensions = list(quiz.scores.keys())
+    for sheet in sheets:
+        quiz.scores = dict.fromkeys(dimensions, 0)
+        for weights in sheet:
+            quiz.add_scores(weights)
+        results.append(quiz.scores)
+    return results
+
+
+def compute_percentages(quiz: PersonalityQuiz, score_list) -> List[Dict[str, float]]:
+    """Hitung persentase setiap hasil lewat PersonalityQuiz.calculate_percentages"""
+    results = []
+    for scores in score_list:
+        quiz.scores = scores
+        results.append(quiz.calculate_percentages())
+    return results
+
+
+def assign_archetypes(percentage_list) -> List[str]:
+    """Tentukan dimensi dominan (archetype) seperti pada display_results"""
+    return [max(percentages.items(), key=lambda x: x[1])[0] for percentages in percentage_list]
+
+
+def match_top_k(subject: Dict[str, float], percentage_list, offset: int, k: int):
+    """
+    Cari k profil terdekat dari subjek dalam satu batch
+
+    Args:
+        subject: Persentase subjek
+        percentage_list: Persentase populasi dalam batch
+        offset: Indeks global elemen pertama batch
+        k: Jumlah profil terdekat
+
+    Returns:
+        list: List tuple (distance, indeks) terurut naik
+    """
+    return heapq.nsmallest(
+        k,
+        ((calculate_euclidean_distance(subject, p), offset + i) for i, p in enumerate(percentage_list))
+    )
+
+
+def time_stages(quiz: PersonalityQuiz, weight_table, scale: int, seed: int, top_k: int, on_batch=None):
+    """
+    Jalankan semua tahap sekali pada satu skala populasi
+
+    Populasi diproses per batch agar memori tetap terbatas pada skala 10M;
+    waktu pembuatan data sintetis tidak ikut dihitung.
+
+    Args:
+        quiz: Objek kuis
+        weight_table: Hasil build_weight_table
+        scale: Jumlah lembar jawaban
+        seed: Seed random
+        top_k: Jumlah profil terdekat untuk matching
+        on_batch: Callback tanpa argumen, dipanggil di akhir setiap batch
+            selagi data batch masih hidup (dipakai untuk snapshot memori)
+
+    Returns:
+        tuple: (detik per tahap, top-k terdekat, jumlah per archetype)
+    """
+    rng = random.Random(seed)
+    subject = compute_percentages(quiz, score_sheets(quiz, generate_answer_sheets(rng, weight_table, 1)))[0]
+    elapsed = dict.fromkeys(STAGES, 0.0)
+    best = []
+    archetype_counts = {}
+
+    done = 0
+    while done < scale:
+        count = min(BATCH_SIZE, scale - done)
+        sheets = generate_answer_sheets(rng, weight_table, count)
+
+        start = time.perf_counter()
+        score_list = score_sheets(quiz, sheets)
+        elapsed["scoring"] += time.perf_counter() - start
+
+        start = time.perf_counter()
+        percentage_list = compute_percentages(quiz, score_list)
+        elapsed["percentages"] += time.perf_counter() - start
+
+        start = time.perf_counter()
+        archetypes = assign_archetypes(percentage_list)
+        elapsed["archetype"] += time.perf_counter() - start
+
+        start = time.perf_counter()
+        best = heapq.nsmallest(top_k, best + match_top_k(subject, percentage_list, done, top_k))
+        elapsed["matching"] += time.perf_counter() - start
+
+        for archetype in archetypes:
+            archetype_counts[archetype] = archetype_counts.get(archetype, 0) + 1
+        if on_batch:
+            on_batch()
+        done += count
+
+    return elapsed, best, archetype_counts
+
+
+def run_scale(quiz: PersonalityQuiz, weight_table, scale: int, seed: int, top_k: int,
+              repeats: int = DEFAULT_REPEATS) -> Dict:
+    """
+    Ukur semua tahap pada satu skala dengan warmup dan beberapa pengulangan
+
+    Warmup memakai satu batch (tidak dicatat); setiap pengulangan memakai
+    data sintetis yang sama (seed sama), lalu dicatat median dan minimum.
+
+    Args:
+        quiz: Objek kuis
+        weight_table: Hasil build_weight_table
+        scale: Jumlah lembar jawaban
+        seed: Seed random
+        top_k: Jumlah profil terdekat untuk matching
+        repeats: Jumlah pengulangan yang diukur
+
+    Returns:
+        dict: Waktu dan throughput per tahap
+    """
+    time_stages(quiz, weight_table, min(scale, BATCH_SIZE), seed, top_k)
+
+    runs = []
+    for _ in range(max(repeats, 1)):
+        elapsed, best, archetype_counts = time_stages(quiz, weight_table, scale, seed, top_k)
+        runs.append(elapsed)
+
+    stages = {}
+    for stage in STAGES:
+        samples = [run[stage] for run in runs]
+        median = statistics.median(samples)
+        minimum = min(samples)
+        stages[stage] = {
+            "seconds": round(median, 6),
+            "seconds_min": round(minimum, 6),
+            "per_item_us": round(median / scale * 1e6, 4),
+            "per_item_us_min": round(minimum / scale * 1e6, 4),
+            "items_per_sec": round(scale / median, 2) if median > 0 else None,
+            "runs": [round(sample, 6) for sample in samples]
+        }
+
+    return {
+        "scale": scale,
+        "repeats": len(runs),
+        "stages": stages,
+        "archetype_counts": dict(sorted(archetype_counts.items())),
+        "top_k": [{"index": index, "distance": round(distance, 4)} for distance, index in best]
+    }
+
+
+def profile_scale(quiz: PersonalityQuiz, weight_table, scale: int, seed: int, top_k: int,
+                  output_dir: str, top_n: int) -> Dict:
+    """
+    Ambil snapshot cProfile dan tracemalloc untuk satu skala
+
+    Args:
+        quiz: Objek kuis
+        weight_table: Hasil build_weight_table
+        scale: Jumlah lembar jawaban yang diprofil
+        seed: Seed random
+        top_k: Jumlah profil terdekat untuk matching
+        output_dir: Folder untuk file .prof
+        top_n: Jumlah baris teratas yang disimpan
+
+    Returns:
+        dict: Ringkasan profil CPU dan alokasi memori
+    """
+    profiler = cProfile.Profile()
+    profiler.enable()
+    time_stages(quiz, weight_table, scale, seed, top_k)
+    profiler.disable()
+
+    prof_file = os.path.join(output_dir, f"profile_{scale}.prof")
+    profiler.dump_stats(prof_file)
+
+    stats = pstats.Stats(profiler)
+    functions = []
+    for (filename, line, name), (cc, nc, tt, ct, _) in stats.stats.items():
+        functions.append({
+            "function": f"{os.path.basename(filename)}:{line}({name})",
+            "calls": nc,
+            "tottime": round(tt, 6),
+            "cumtime": round(ct, 6)
+        })
+    functions.sort(key=lambda x: x["cumtime"], reverse=True)
+
+    # Snapshot diambil di dalam loop batch, pada batch dengan memori terpakai
+    # tertinggi, supaya alokasi data batch masih terlihat
+    peak_snapshot = {"bytes": -1, "snapshot": None}
+
+    def snapshot_if_peak():
+        current_bytes = tracemalloc.get_traced_memory()[0]
+        if current_bytes > peak_snapshot["bytes"]:
+            peak_snapshot["bytes"] = current_bytes
+            peak_snapshot["snapshot"] = tracemalloc.take_snapshot()
+
+    tracemalloc.start()
+    time_stages(quiz, weight_table, scale, seed, top_k, on_batch=snapshot_if_peak)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    snapshot = peak_snapshot["snapshot"].filter_traces([
+        tracemalloc.Filter(False, tracemalloc.__file__)
+    ])
+    allocations = []
+    for stat in snapshot.statistics("lineno")[:top_n]:
+        frame = stat.traceback[0]
+        allocations.append({
+            "location": f"{os.path.basename(frame.filename)}:{frame.lineno}",
+            "size_bytes": stat.size,
+            "count": stat.count
+        })
+
+    return {
+        "scale": scale,
+        "prof_file": os.path.basename(prof_file),
+        "cpu_top": functions[:top_n],
+        "memory": {
+            "snapshot_bytes": peak_snapshot["bytes"],
+            "peak_bytes": peak,
+            "top_allocations": allocations
+        }
+    }
+
+
+def comparability_issues(baseline: Dict, current: Dict) -> List[str]:
+    """
+    Cek apakah dua hasil benchmark diukur dengan setup yang sama
+
+    Args:
+        baseline: JSON hasil benchmark sebelumnya
+        current: JSON hasil benchmark sekarang
+
+    Returns:
+        list: Perbedaan config/environment, kosong jika bisa dibandingkan
+    """
+    issues = []
+    for section, keys in COMPARABLE_FIELDS.items():
+        for key in keys:
+            old_value = baseline.get(section, {}).get(key)
+            new_value = current.get(section, {}).get(key)
+            if key == "python":
+                # Patch version boleh beda, major.minor harus sama
+                old_value = ".".join(str(old_value).split(".")[:2]) if old_value else old_value
+                new_value = ".".join(str(new_value).split(".")[:2]) if new_value else new_value
+            if old_value != new_value:
+                issues.append(f"{section}.{key}: {old_value} != {new_value}")
+    return issues
+
+
+def compare_results(baseline: Dict, current: Dict, threshold: float,
+                    min_seconds: float = MIN_COMPARE_SECONDS) -> List[str]:
+    """
+    Bandingkan median dua hasil benchmark dan laporkan regresi
+
+    Tahap yang median waktunya di bawah min_seconds (di salah satu hasil)
+    dilewati karena noise-nya lebih besar dari threshold.
+
+    Args:
+        baseline: JSON hasil benchmark sebelumnya
+        current: JSON hasil benchmark sekarang
+        threshold: Batas kenaikan median per_item_us (0.10 = 10%)
+        min_seconds: Median waktu minimum agar tahap dibandingkan
+
+    Returns:
+        list: Pesan regresi, kosong jika tidak ada
+
+    Raises:
+        ValueError: Jika config atau environment kedua hasil berbeda
+    """
+    issues = comparability_issues(baseline, current)
+    if issues:
+        raise ValueError("Hasil tidak bisa dibandingkan: " + "; ".join(issues))
+
+    regressions = []
+    baseline_scales = {entry["scale"]: entry for entry in baseline.get("results", [])}
+
+    for entry in current.get("results", []):
+        old = baseline_scales.get(entry["scale"])
+        if not old:
+            continue
+        for stage, values in entry["stages"].items():
+            old_stage = old["stages"].get(stage, {})
+            if min(old_stage.get("seconds", 0.0), values["seconds"]) < min_seconds:
+                continue
+            old_value = old_stage.get("per_item_us")
+            new_value = values["per_item_us"]
+            if old_value and new_value > old_value * (1 + threshold):
+                change = (new_value / old_value - 1) * 100
+                regressions.append(
+                    f"{stage} @ {entry['scale']}: {old_value:.4f}us -> {new_value:.4f}us (+{change:.1f}%)"
+                )
+
+    return regressions
+
+
+def parse_args():
+    """Parse argumen command line"""
+    parser = argparse.ArgumentParser(description="Benchmark scoring dan matching personality test")
+    parser.add_argument("--scales", default=",".join(str(s) for s in DEFAULT_SCALES),
+                        help="Daftar ukuran populasi dipisah koma (default: 1000,100000,10000000)")
+    parser.add_argument("--questions", default=DEFAULT_QUESTIONS,
+                        help="Nama file pertanyaan di folder questions")
+    parser.add_argument("--seed", type=int, default=42, help="Seed random untuk data sintetis")
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS,
+                        help="Jumlah pengulangan per skala; yang dicatat median dan minimum")
+    parser.add_argument("--top-k", type=int, default=10, help="Jumlah profil terdekat untuk matching")
+    parser.add_argument("--profile-scale", type=int, default=1_000,
+                        help="Ukuran populasi untuk snapshot cProfile/tracemalloc (0 = tidak diprofil)")
+    parser.add_argument("--top-n", type=int, default=20, help="Jumlah baris teratas di ringkasan profil")
+    parser.add_argument("--output", default=None, help="Path file JSON hasil")
+    parser.add_argument("--compare", default=None, help="File JSON hasil sebelumnya untuk deteksi regresi")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="Batas regresi relatif median per tahap (default: 0.10)")
+    parser.add_argument("--min-compare-seconds", type=float, default=MIN_COMPARE_SECONDS,
+                        help="Tahap dengan median lebih singkat dari ini tidak dibandingkan")
+    return parser.parse_args()
+
+
+def main():
+    """
+    Main function
+    """
+    args = parse_args()
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    json_file = os.path.join(script_dir, "questions", args.questions)
+
+    if not os.path.exists(json_file):
+        print(f"Error: File {args.questions} tidak ditemukan di {json_file}")
+        sys.exit(1)
+
+    scales = [int(s) for s in args.scales.split(",") if s.strip()]
+    timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+    output_dir = os.path.join(script_dir, "benchmark_result")
+    os.makedirs(output_dir, exist_ok=True)
+    output_file = args.output or os.path.join(output_dir, f"benchmark_{timestamp}.json")
+
+    quiz = load_quiz(json_file)
+    weight_table = build_weight_table(quiz)
+
+    print("=" * 80)
+    print("BENCHMARK PERSONALITY TEST")
+    print("=" * 80)
+    print()
+
+    results = []
+    for scale in scales:
+        print(f"Menjalankan skala {scale:,} ...")
+        entry = run_scale(quiz, weight_table, scale, args.seed, args.top_k, args.repeats)
+        results.append(entry)
+        for stage, values in entry["stages"].items():
+            print(f"   {stage:<12}: {values['seconds']:>10.4f} s  "
+                  f"(median {values['per_item_us']:.4f} us/item, min {values['per_item_us_min']:.4f})")
+        print()
+
+    profile = None
+    if args.profile_scale > 0:
+        print(f"Mengambil snapshot cProfile dan tracemalloc (skala {args.profile_scale:,}) ...")
+        profile = profile_scale(quiz, weight_table, args.profile_scale, args.seed,
+                                args.top_k, output_dir, args.top_n)
+        print(f"   Peak memory: {profile['memory']['peak_bytes'] / 1024:.1f} KiB")
+        print()
+
+    report = {
+        "timestamp": timestamp,
+        "environment": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform()
+        },
+        "config": {
+            "questions": args.questions,
+            "question_count": len(quiz.questions),
+            "seed": args.seed,
+            "top_k": args.top_k,
+            "repeats": args.repeats,
+            "batch_size": BATCH_SIZE
+        },
+        "results": results,
+        "profile": profile
+    }
+
+    with open(output_file, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+    print(f"Hasil disimpan ke: {output_file}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        print()
+        try:
+            regressions = compare_results(baseline, report, args.threshold, args.min_compare_seconds)
+        except ValueError as e:
+            print(f"Error: {e}")
+            sys.exit(2)
+        if regressions:
+            print("REGRESI TERDETEKSI:")
+            for message in regressions:
+                print(f"   - {message}")
+            sys.exit(1)
+        print("Tidak ada regresi dibanding baseline.")
+
+
+if __name__ == "__main__":
+    main()
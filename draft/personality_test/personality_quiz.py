@@ -8,6 +8,8 @@ import os
 from typing import Dict, List
 from datetime import datetime
 
+from population_stats import CURRENT_VERSION, PopulationStats, STATS_FILENAME, locked, rebuild_from_results
+
 class PersonalityQuiz:
     def __init__(self, json_file: str, user_name: str):
         """Initialize quiz dengan file JSON"""
@@ -264,6 +266,7 @@ class PersonalityQuiz:
         result_data = {
             "nama": self.user_name,
             "timestamp": timestamp,
+            "versi_soal": os.path.basename(self.json_file),
             "dimensi": {}
         }
         
@@ -274,8 +277,33 @@ class PersonalityQuiz:
                 "percentage": percentages[dimension]
             }
         
-        with open(json_filename, 'w', encoding='utf-8') as f:
-            json.dump(result_data, f, indent=2, ensure_ascii=False)
+        # 3. Update statistik populasi dan tampilkan posisi user
+        # Lock dipegang dari load sampai save supaya kuis yang selesai
+        # bersamaan tidak saling menimpa statistik
+        stats_file = os.path.join(test_result_dir, STATS_FILENAME)
+        version = os.path.basename(self.json_file)
+        
+        with locked(stats_file):
+            # Sketch tidak bisa menghapus nilai lama: saat user mengulang kuis
+            # (hasil.json lama ditimpa) atau file statistik belum ada, bangun
+            # ulang dari hasil.json user lain supaya sama dengan --rebuild
+            if os.path.exists(stats_file) and not os.path.exists(json_filename):
+                stats = PopulationStats.load(stats_file)
+            else:
+                stats = rebuild_from_results(test_result_dir, exclude=[self.user_name])
+            
+            with open(json_filename, 'w', encoding='utf-8') as f:
+                json.dump(result_data, f, indent=2, ensure_ascii=False)
+            
+            if stats.count(dominant_dimension[0], version) > 0:
+                print("\nPosisi Kamu Dibanding Pengguna Lain:\n")
+                for dimension, percentage in sorted_dimensions:
+                    rank = stats.percentile_rank(dimension, percentage, version)
+                    if rank is not None:
+                        print(f"   {dimension.capitalize():<15}: lebih tinggi dari {rank:.2f}% pengguna")
+            
+            stats.add_result(percentages, version)
+            stats.save(stats_file)
         
         print(f"\nHasil tersimpan di folder: {user_folder}")
         print(f"  - {os.path.basename(txt_filename)} (statistik detail)")
@@ -285,7 +313,7 @@ class PersonalityQuiz:
 def main():
     """Main function"""
     # Path to JSON file (di folder questions)
-    questions = "questions5.json"
+    questions = CURRENT_VERSION
     script_dir = os.path.dirname(os.path.abspath(__file__))
     json_file = os.path.join(script_dir, "questions", questions)
     
@@ -0,0 +1,402 @@
+"""
+Population Statistics
+Statistik persentil populasi per dimensi kepribadian menggunakan KLL sketch
+(streaming, memori terbatas, bisa di-serialize dan di-merge antar proses)
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import time
+from bisect import bisect_left, bisect_right
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional
+
+from euclidean import extract_percentages, get_all_test_folders, load_json_from_folder
+
+# Bank soal yang dipakai personality_quiz.py; juga dipakai untuk hasil lama
+# yang belum mencatat versi_soal
+CURRENT_VERSION = "questions5.json"
+DEFAULT_K = 200
+STATS_FILENAME = "population_stats.json"
+# Batas tunggu lock file statistik, dan umur lock yang dianggap sisa proses mati
+LOCK_TIMEOUT = 10.0
+LOCK_STALE_SECONDS = 60.0
+
+
+class KLLSketch:
+    """
+    Quantile sketch KLL (Karnin, Lang, Liberty)
+
+    Menyimpan O(k log(n/k)) item untuk n nilai; setiap update amortized O(1)
+    dan dua sketch bisa digabung tanpa kehilangan jaminan error.
+    """
+
+    def __init__(self, k: int = DEFAULT_K, c: float = 2.0 / 3.0, seed: Optional[int] = None):
+        self.k = k
+        self.c = c
+        self.n = 0
+        self.min_value = None
+        self.max_value = None
+        self.compactors: List[List[float]] = []
+        self.max_size = 0
+        # Jumlah item yang tersimpan di semua compactor
+        self.size = 0
+        self._random = random.Random(seed)
+        self._sorted_cache = None
+        self._grow()
+
+    def _grow(self):
+        """Tambah satu level compactor dan hitung ulang kapasitas total"""
+        self.compactors.append([])
+        self.max_size = sum(self._capacity(h) for h in range(len(self.compactors)))
+
+    def _capacity(self, height: int) -> int:
+        """Kapasitas compactor pada level tertentu (level atas paling besar)"""
+        depth = len(self.compactors) - height - 1
+        return int(math.ceil((self.c ** depth) * self.k)) + 1
+
+    def _compact(self, height: int):
+        """Sortir compactor, ambil setengah item (offset acak) ke level berikutnya"""
+        if height + 1 >= len(self.compactors):
+            self._grow()
+
+        items = sorted(self.compactors[height])
+        leftover = [items.pop()] if len(items) % 2 else []
+        offset = self._random.randint(0, 1)
+        promoted = items[offset::2]
+        self.compactors[height + 1].extend(promoted)
+        self.compactors[height] = leftover
+        self.size -= len(items) - len(promoted)
+
+    def _compress(self):
+        """Compact level yang penuh sampai ukuran total kembali di bawah batas"""
+        for height in range(len(self.compactors)):
+            if len(self.compactors[height]) >= self._capacity(height):
+                self._compact(height)
+                if self.size < self.max_size:
+                    break
+
+    def update(self, value: float):
+        """Tambahkan satu nilai ke sketch"""
+        self.n += 1
+        self.min_value = value if self.min_value is None else min(self.min_value, value)
+        self.max_value = value if self.max_value is None else max(self.max_value, value)
+        self.compactors[0].append(value)
+        self.size += 1
+        self._sorted_cache = None
+        if self.size >= self.max_size:
+            self._compress()
+
+    def merge(self, other: "KLLSketch"):
+        """Gabungkan sketch lain ke sketch ini (misalnya dari worker lain)"""
+        if other.n == 0:
+            return
+        while len(self.compactors) < len(other.compactors):
+            self._grow()
+        for height, compactor in enumerate(other.compactors):
+            self.compactors[height].extend(compactor)
+
+        self.size += other.size
+        self.n += other.n
+        self.min_value = other.min_value if self.min_value is None else min(self.min_value, other.min_value)
+        self.max_value = other.max_value if self.max_value is None else max(self.max_value, other.max_value)
+        self._sorted_cache = None
+        while self.size >= self.max_size:
+            self._compress()
+
+    def _weighted_items(self):
+        """List (nilai, bobot kumulatif) terurut; di-cache sampai ada update"""
+        if self._sorted_cache is None:
+            items = sorted(
+                (value, 2 ** height)
+                for height, compactor in enumerate(self.compactors)
+                for value in compactor
+            )
+            values, cumulative = [], []
+            total = 0
+            for value, weight in items:
+                total += weight
+                values.append(value)
+                cumulative.append(total)
+            self._sorted_cache = (values, cumulative, total)
+        return self._sorted_cache
+
+    def rank(self, value: float, inclusive: bool = False) -> float:
+        """
+        Perkiraan fraksi nilai yang lebih kecil dari value
+
+        Args:
+            value: Nilai yang dicari
+            inclusive: True untuk menghitung nilai <= value
+
+        Returns:
+            float: Fraksi antara 0.0 dan 1.0
+        """
+        values, cumulative, total = self._weighted_items()
+        if total == 0:
+            return 0.0
+        index = bisect_right(values, value) if inclusive else bisect_left(values, value)
+        return (cumulative[index - 1] if index else 0) / total
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Perkiraan nilai pada kuantil q (0.0 - 1.0)"""
+        values, cumulative, total = self._weighted_items()
+        if total == 0:
+            return None
+        index = bisect_left(cumulative, q * total)
+        return values[min(index, len(values) - 1)]
+
+    def to_dict(self) -> Dict:
+        return {
+            "k": self.k,
+            "c": self.c,
+            "n": self.n,
+            "min": self.min_value,
+            "max": self.max_value,
+            "compactors": self.compactors
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "KLLSketch":
+        sketch = cls(k=data["k"], c=data["c"])
+        sketch.compactors = [list(compactor) for compactor in data["compactors"]] or [[]]
+        sketch.max_size = sum(sketch._capacity(h) for h in range(len(sketch.compactors)))
+        sketch.size = sum(len(compactor) for compactor in sketch.compactors)
+        sketch.n = data["n"]
+        sketch.min_value = data["min"]
+        sketch.max_value = data["max"]
+        return sketch
+
+
+class PopulationStats:
+    """Kumpulan KLLSketch per versi bank soal dan per dimensi"""
+
+    def __init__(self, k: int = DEFAULT_K):
+        self.k = k
+        self.sketches: Dict[str, Dict[str, KLLSketch]] = {}
+
+    def _sketch(self, dimension: str, version: str) -> Optional[KLLSketch]:
+        return self.sketches.get(version, {}).get(dimension)
+
+    def add_result(self, percentages: Dict[str, float], version: str = CURRENT_VERSION):
+        """
+        Tambahkan satu hasil kuis
+
+        Args:
+            percentages: Dictionary persentase per dimensi
+            version: Versi bank soal (nama file pertanyaan)
+        """
+        by_dimension = self.sketches.setdefault(version, {})
+        for dimension, percentage in percentages.items():
+            if dimension not in by_dimension:
+                by_dimension[dimension] = KLLSketch(k=self.k)
+            by_dimension[dimension].update(percentage)
+
+    def count(self, dimension: str, version: str = CURRENT_VERSION) -> int:
+        sketch = self._sketch(dimension, version)
+        return sketch.n if sketch else 0
+
+    def percentile_rank(self, dimension: str, value: float, version: str = CURRENT_VERSION) -> Optional[float]:
+        """
+        Persentase pengguna dengan nilai lebih rendah dari value
+
+        Returns:
+            float: 0 - 100, atau None jika belum ada data
+        """
+        sketch = self._sketch(dimension, version)
+        if not sketch or sketch.n == 0:
+            return None
+        return round(sketch.rank(value) * 100, 2)
+
+    def quantile(self, dimension: str, q: float, version: str = CURRENT_VERSION) -> Optional[float]:
+        sketch = self._sketch(dimension, version)
+        return sketch.quantile(q) if sketch else None
+
+    def histogram(self, dimension: str, version: str = CURRENT_VERSION, bin_width: float = 10.0) -> List[Dict]:
+        """
+        Histogram perkiraan jumlah pengguna per rentang persentase (0 - 100)
+
+        Returns:
+            list: List dict {"start", "end", "count"}
+        """
+        sketch = self._sketch(dimension, version)
+        if not sketch or sketch.n == 0:
+            return []
+
+        bins = []
+        start = 0.0
+        previous = 0
+        while start < 100.0:
+            end = min(start + bin_width, 100.0)
+            # Bin terakhir menyertakan nilai 100; pembulatan kumulatif supaya
+            # total count sama dengan n
+            cumulative = round(sketch.rank(end, inclusive=end >= 100.0) * sketch.n)
+            bins.append({
+                "start": start,
+                "end": end,
+                "count": cumulative - previous
+            })
+            previous = cumulative
+            start = end
+        return bins
+
+    def merge(self, other: "PopulationStats"):
+        """Gabungkan statistik dari proses lain"""
+        for version, by_dimension in other.sketches.items():
+            target = self.sketches.setdefault(version, {})
+            for dimension, sketch in by_dimension.items():
+                if dimension not in target:
+                    target[dimension] = KLLSketch(k=self.k)
+                target[dimension].merge(sketch)
+
+    def to_dict(self) -> Dict:
+        return {
+            "k": self.k,
+            "versions": {
+                version: {dimension: sketch.to_dict() for dimension, sketch in by_dimension.items()}
+                for version, by_dimension in self.sketches.items()
+            }
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "PopulationStats":
+        stats = cls(k=data.get("k", DEFAULT_K))
+        for version, by_dimension in data.get("versions", {}).items():
+            stats.sketches[version] = {
+                dimension: KLLSketch.from_dict(sketch) for dimension, sketch in by_dimension.items()
+            }
+        return stats
+
+    def save(self, path: str):
+        """Simpan ke file JSON (ditulis atomik lewat file sementara)"""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "PopulationStats":
+        """Muat dari file JSON; kembalikan statistik kosong jika file belum ada"""
+        if not os.path.exists(path):
+            return cls()
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls.from_dict(json.load(f))
+
+
+@contextmanager
+def locked(path: str, timeout: float = LOCK_TIMEOUT):
+    """
+    Lock antar proses untuk file statistik (load -> update -> save)
+
+    Lock berupa file path.lock yang dibuat atomik; lock yang lebih tua dari
+    LOCK_STALE_SECONDS dianggap sisa proses yang mati dan dihapus.
+
+    Args:
+        path: Path file statistik
+        timeout: Detik maksimal menunggu lock
+
+    Raises:
+        TimeoutError: Jika lock tidak didapat dalam timeout
+    """
+    lock_path = f"{path}.lock"
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            os.close(os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            break
+        except FileExistsError:
+            try:
+                if time.time() - os.path.getmtime(lock_path) > LOCK_STALE_SECONDS:
+                    os.remove(lock_path)
+                    continue
+            except FileNotFoundError:
+                continue
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"Lock {lock_path} masih dipegang proses lain")
+            time.sleep(0.05)
+    try:
+        yield
+    finally:
+        os.remove(lock_path)
+
+
+def rebuild_from_results(test_result_dir: str, legacy_version: str = CURRENT_VERSION,
+                         exclude: Iterable[str] = ()) -> PopulationStats:
+    """
+    Bangun ulang statistik dari semua hasil.json di folder test_result
+
+    Args:
+        test_result_dir: Path ke folder test_result
+        legacy_version: Versi bank soal untuk hasil tanpa versi_soal
+        exclude: Nama folder yang dilewati (misalnya user yang sedang mengulang kuis)
+
+    Returns:
+        PopulationStats: Statistik populasi
+    """
+    stats = PopulationStats()
+    for folder in get_all_test_folders(test_result_dir):
+        if folder in exclude:
+            continue
+        data = load_json_from_folder(os.path.join(test_result_dir, folder))
+        if data:
+            stats.add_result(extract_percentages(data), data.get('versi_soal', legacy_version))
+    return stats
+
+
+def main():
+    """
+    Main function
+    """
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    test_result_dir = os.path.join(script_dir, "test_result")
+    default_stats_file = os.path.join(test_result_dir, STATS_FILENAME)
+
+    parser = argparse.ArgumentParser(description="Statistik persentil populasi personality test")
+    parser.add_argument("--stats", default=default_stats_file, help="Path file statistik")
+    parser.add_argument("--version", default=CURRENT_VERSION,
+                        help=f"Versi bank soal untuk query dan untuk hasil lama saat --rebuild (default: {CURRENT_VERSION})")
+    parser.add_argument("--rebuild", action="store_true", help="Bangun ulang dari folder test_result")
+    parser.add_argument("--merge", nargs="*", default=[], help="File statistik lain yang digabungkan")
+    parser.add_argument("--dimension", help="Dimensi untuk query")
+    parser.add_argument("--value", type=float, help="Persentase untuk query percentile rank")
+    parser.add_argument("--bin-width", type=float, default=10.0, help="Lebar bin histogram")
+    args = parser.parse_args()
+
+    if args.rebuild or args.merge:
+        with locked(args.stats):
+            if args.rebuild:
+                stats = rebuild_from_results(test_result_dir, args.version)
+            else:
+                stats = PopulationStats.load(args.stats)
+            for path in args.merge:
+                stats.merge(PopulationStats.load(path))
+            stats.save(args.stats)
+        print(f"Statistik disimpan ke: {args.stats}")
+    else:
+        stats = PopulationStats.load(args.stats)
+
+    if not args.dimension:
+        for version, by_dimension in stats.sketches.items():
+            print(f"\nVersi soal: {version}")
+            for dimension, sketch in by_dimension.items():
+                print(f"   {dimension.capitalize():<15}: n={sketch.n:<8} "
+                      f"median={sketch.quantile(0.5)}  min={sketch.min_value}  max={sketch.max_value}")
+        return
+
+    if args.value is not None:
+        rank = stats.percentile_rank(args.dimension, args.value, args.version)
+        if rank is None:
+            print(f"Belum ada data untuk dimensi {args.dimension} (versi {args.version})")
+            return
+        print(f"{args.dimension.capitalize()} {args.value:.2f}% lebih tinggi dari {rank:.2f}% pengguna")
+
+    print(f"\nHistogram {args.dimension.capitalize()} (n={stats.count(args.dimension, args.version)}):")
+    for bucket in stats.histogram(args.dimension, args.version, args.bin_width):
+        print(f"   {bucket['start']:>5.1f} - {bucket['end']:>5.1f}: {bucket['count']}")
+
+
+if __name__ == "__main__":
+    main()
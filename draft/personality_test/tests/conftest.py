@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Supaya script di folder personality_test bisa di-import dari test
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,62 @@
+import copy
+
+import pytest
+
+from benchmark import compare_results
+
+
+def make_report(per_item_us, seconds=1.0, scale=1000):
+    return {
+        "environment": {"python": "3.11.7", "implementation": "CPython", "platform": "Linux"},
+        "config": {"questions": "questions5.json", "question_count": 15, "batch_size": 10000, "top_k": 10},
+        "results": [{
+            "scale": scale,
+            "stages": {"scoring": {"seconds": seconds, "per_item_us": per_item_us}}
+        }]
+    }
+
+
+def test_regression_above_threshold_is_reported():
+    regressions = compare_results(make_report(5.0), make_report(6.0), threshold=0.10, min_seconds=0.0)
+
+    assert len(regressions) == 1
+    assert regressions[0].startswith("scoring @ 1000")
+
+
+def test_change_within_threshold_is_not_reported():
+    assert compare_results(make_report(5.0), make_report(5.4), threshold=0.10, min_seconds=0.0) == []
+
+
+def test_stage_below_min_seconds_is_skipped():
+    baseline = make_report(5.0, seconds=0.01)
+    current = make_report(10.0, seconds=0.02)
+
+    assert compare_results(baseline, current, threshold=0.10, min_seconds=0.05) == []
+
+
+def test_scale_missing_from_baseline_is_skipped():
+    baseline = make_report(5.0, scale=1000)
+    current = make_report(50.0, scale=100000)
+
+    assert compare_results(baseline, current, threshold=0.10, min_seconds=0.0) == []
+
+
+def test_python_patch_version_difference_is_allowed():
+    current = make_report(5.0)
+    current["environment"]["python"] = "3.11.9"
+
+    assert compare_results(make_report(5.0), current, threshold=0.10, min_seconds=0.0) == []
+
+
+@pytest.mark.parametrize("section, key, value", [
+    ("config", "questions", "questions4.json"),
+    ("config", "batch_size", 5000),
+    ("environment", "implementation", "PyPy"),
+    ("environment", "python", "3.12.1"),
+])
+def test_different_setup_is_refused(section, key, value):
+    current = copy.deepcopy(make_report(5.0))
+    current[section][key] = value
+
+    with pytest.raises(ValueError, match=key):
+        compare_results(make_report(5.0), current, threshold=0.10, min_seconds=0.0)
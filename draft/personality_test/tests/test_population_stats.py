@@ -0,0 +1,118 @@
+import json
+import os
+import random
+from bisect import bisect_left
+
+import pytest
+
+from population_stats import KLLSketch, PopulationStats, locked, rebuild_from_results
+
+
+def exact_rank(sorted_values, value):
+    return bisect_left(sorted_values, value) / len(sorted_values)
+
+
+def random_values(count, seed):
+    rng = random.Random(seed)
+    return [round(rng.uniform(0, 100), 2) for _ in range(count)]
+
+
+def test_rank_is_close_to_exact_rank():
+    values = random_values(20000, seed=1)
+    sketch = KLLSketch(seed=1)
+    for value in values:
+        sketch.update(value)
+
+    ordered = sorted(values)
+    for probe in (5, 25, 50, 75, 95):
+        assert sketch.rank(probe) == pytest.approx(exact_rank(ordered, probe), abs=0.02)
+    assert sketch.size < len(values)
+
+
+def test_running_size_matches_stored_items():
+    sketch = KLLSketch(k=50, seed=2)
+    for value in random_values(5000, seed=2):
+        sketch.update(value)
+        assert sketch.size == sum(len(compactor) for compactor in sketch.compactors)
+
+
+def test_merge_matches_single_stream():
+    first, second = random_values(8000, seed=3), random_values(8000, seed=4)
+    single = KLLSketch(seed=5)
+    left, right = KLLSketch(seed=6), KLLSketch(seed=7)
+    for value in first:
+        single.update(value)
+        left.update(value)
+    for value in second:
+        single.update(value)
+        right.update(value)
+
+    left.merge(right)
+
+    ordered = sorted(first + second)
+    assert left.n == single.n == len(ordered)
+    assert left.size == sum(len(compactor) for compactor in left.compactors)
+    for probe in (10, 50, 90):
+        assert left.rank(probe) == pytest.approx(exact_rank(ordered, probe), abs=0.02)
+        assert left.rank(probe) == pytest.approx(single.rank(probe), abs=0.03)
+
+
+def test_round_trip_keeps_ranks_and_counts():
+    stats = PopulationStats()
+    for value in random_values(3000, seed=8):
+        stats.add_result({"logic": value, "empathy": 100 - value})
+
+    restored = PopulationStats.from_dict(json.loads(json.dumps(stats.to_dict())))
+
+    for dimension in ("logic", "empathy"):
+        assert restored.count(dimension) == stats.count(dimension)
+        assert restored.quantile(dimension, 0.5) == stats.quantile(dimension, 0.5)
+        assert restored.percentile_rank(dimension, 42.0) == stats.percentile_rank(dimension, 42.0)
+        assert restored.sketches["questions5.json"][dimension].size == stats.sketches["questions5.json"][dimension].size
+
+
+@pytest.mark.parametrize("bin_width", [10.0, 7.0, 33.3])
+def test_histogram_counts_sum_to_n(bin_width):
+    stats = PopulationStats()
+    for value in random_values(2500, seed=9) + [0.0, 100.0]:
+        stats.add_result({"logic": value})
+
+    bins = stats.histogram("logic", bin_width=bin_width)
+
+    assert sum(bucket["count"] for bucket in bins) == stats.count("logic")
+    assert bins[-1]["end"] == 100.0
+
+
+def test_empty_and_unknown_version_have_no_data():
+    stats = PopulationStats()
+    assert stats.count("logic") == 0
+    assert stats.percentile_rank("logic", 50.0) is None
+    assert stats.quantile("logic", 0.5) is None
+    assert stats.histogram("logic") == []
+
+    stats.add_result({"logic": 50.0}, version="questions5.json")
+    assert stats.count("logic", version="questions4.json") == 0
+    assert stats.percentile_rank("logic", 50.0, version="questions4.json") is None
+    assert stats.histogram("logic", version="questions4.json") == []
+    assert stats.percentile_rank("courage", 50.0) is None
+
+
+def test_rebuild_skips_excluded_folders(tmp_path):
+    for name, value in (("Timun Mas", 20.0), ("Sengeda", 80.0)):
+        os.makedirs(tmp_path / name)
+        with open(tmp_path / name / "hasil.json", "w", encoding="utf-8") as f:
+            json.dump({"nama": name, "dimensi": {"logic": {"percentage": value}}}, f)
+
+    assert rebuild_from_results(str(tmp_path)).count("logic") == 2
+    assert rebuild_from_results(str(tmp_path), exclude=["Sengeda"]).count("logic") == 1
+
+
+def test_lock_times_out_while_held(tmp_path):
+    stats_file = str(tmp_path / "population_stats.json")
+
+    with locked(stats_file):
+        with pytest.raises(TimeoutError):
+            with locked(stats_file, timeout=0.1):
+                pass
+
+    assert not os.path.exists(f"{stats_file}.lock")